@@ -12,14 +12,31 @@ from datetime import datetime
 import asyncio
 from seolyzer.core.analyzer import SEOAnalyzer
 import os
-import re
 import aiohttp
 
+try:
+    from orjson import loads as json_loads
+except ImportError:  # orjson not installed, fall back to the standard library
+    json_loads = json.loads
+
 console = Console()
 
+# Upper bound for URLs analyzed at the same time, must stay below the
+# analyzer's connection pool limit so requests never queue for a connection
+MAX_CONCURRENT_REQUESTS = 16
+
+# Lighthouse runs regularly take 10-30+ s, so PageSpeed calls get their own
+# overall limit (aiohttp's default) instead of the page fetch timeouts
+PAGESPEED_TIMEOUT = aiohttp.ClientTimeout(total=300)
+
+# Buffer size for reading URL input files and writing CSV reports
+FILE_BUFFER_SIZE = 1 << 20
+
+URL_PREFIXES = ('http://', 'https://')
+
 def is_url(string):
-    # Simple URL check
-    return re.match(r'^https?://', string.strip()) is not None
+    # Simple URL check, a prefix test is all that is needed here
+    return string.strip().startswith(URL_PREFIXES)
 
 @click.command()
 @click.argument('input_path')
@@ -39,11 +56,8 @@ def main(input_path, output, format, depth, pagespeed, verbose):
 async def run_analysis(input_path, output, format, depth, pagespeed, verbose):
     urls = []
     if os.path.isfile(input_path):
-        with open(input_path, 'r', encoding='utf-8') as f:
-            for line in f:
-                line = line.strip()
-                if line and is_url(line):
-                    urls.append(line)
+        with open(input_path, 'r', encoding='utf-8', buffering=FILE_BUFFER_SIZE) as f:
+            urls = [line for line in map(str.strip, f) if line.startswith(URL_PREFIXES)]
     elif is_url(input_path):
         urls = [input_path.strip()]
     else:
@@ -54,81 +68,110 @@ async def run_analysis(input_path, output, format, depth, pagespeed, verbose):
         console.print(f"[red]No valid URLs found![/red]")
         return
 
+    # Each URL only needs to be analyzed once, keep the input order
+    unique_urls = list(dict.fromkeys(urls))
+    if len(unique_urls) < len(urls):
+        console.print(f"[yellow]Skipping {len(urls) - len(unique_urls)} duplicate URL(s)[/yellow]")
+        urls = unique_urls
+
     console.print(f"[yellow]Analyzing the following URLs:[/yellow]")
     for u in urls:
         console.print(f" - {u}")
 
-    analyzer = SEOAnalyzer()
-    results_list = []
-    for url in urls:
-        console.print(f"[bold green]SEOlyzer[/bold green] - SEO analysis for {url}")
-        result = await analyzer.analyze_url(url, depth)
-        result["url"] = url
-        result["timestamp"] = datetime.now().isoformat()
-        # PageSpeed Insights only if option is set
-        if pagespeed:
-            result["pagespeed"] = await analyze_pagespeed(url)
-        results_list.append(result)
-        if verbose:
-            display_results(result)
-    await analyzer.close()
-
-    write_csv(output, results_list, pagespeed)
+    with open(output, 'w', encoding='utf-8', newline='', buffering=FILE_BUFFER_SIZE) as csvfile:
+        writer = csv.writer(csvfile)
+        writer.writerow(csv_fieldnames(pagespeed))
+        analyzer = SEOAnalyzer()
+        # One session (and connection pool) for page fetches and PageSpeed calls
+        session = analyzer.get_session()
+        semaphore = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
+        # All results of a run share the timestamp of the batch start
+        timestamp = datetime.now().isoformat()
+
+        async def analyze_one(url):
+            async with semaphore:
+                console.print(f"[bold green]SEOlyzer[/bold green] - SEO analysis for {url}")
+                try:
+                    result = await analyzer.analyze_url(url, depth)
+                    # PageSpeed Insights only if option is set
+                    if pagespeed:
+                        result["pagespeed"] = await analyze_pagespeed(url, session)
+                except Exception as e:
+                    result = {"error": str(e)}
+                result["url"] = url
+                result["timestamp"] = timestamp
+                return result
+
+        try:
+            # Rows are written as soon as a URL is done, so results are not kept in memory
+            for future in asyncio.as_completed([analyze_one(url) for url in urls]):
+                result = await future
+                writer.writerow(csv_row(result, pagespeed))
+                if verbose:
+                    display_results(result)
+        finally:
+            await analyzer.close()
+
     console.print(f"\n[green]CSV report saved to {output}[/green]")
 
-def write_csv(output, results_list, pagespeed):
-    fieldnames = [
-        'URL',
-        'Title tag content',
-        'Description tag content',
-        'H1 header count',
-        'H1 header content',
-        'H2 header count',
-        'H2 header content',
-        'Image count',
-        'Load time',
-        'Size',
-        'Viewport tag',
-        'Canonical',
-        'hreflang',
-        'Noindex',
-    ]
+CSV_FIELDNAMES = [
+    'URL',
+    'Title tag content',
+    'Description tag content',
+    'H1 header count',
+    'H1 header content',
+    'H2 header count',
+    'H2 header content',
+    'Image count',
+    'Load time',
+    'Size',
+    'Viewport tag',
+    'Canonical',
+    'hreflang',
+    'Noindex',
+]
+PAGESPEED_FIELDNAMES = ['PageSpeed Score', 'LCP', 'CLS', 'FID']
+# Shared read-only defaults, so missing result sections allocate nothing per row
+_EMPTY_DICT = {}
+_EMPTY_TUPLE = ()
+
+def csv_fieldnames(pagespeed):
+    """Returns the CSV header row, with the PageSpeed columns if requested"""
+    return CSV_FIELDNAMES + PAGESPEED_FIELDNAMES if pagespeed else CSV_FIELDNAMES
+
+def csv_row(results, pagespeed):
+    """Builds the CSV row for one analysis result, in the order of the fieldnames"""
+    meta = results.get('meta_tags', _EMPTY_DICT)
+    headers = results.get('headers', _EMPTY_DICT)
+    images = results.get('images', _EMPTY_DICT)
+    perf = results.get('performance', _EMPTY_DICT)
+    mobile = results.get('mobile_friendly', _EMPTY_DICT)
+    tech = results.get('technical_seo', _EMPTY_DICT)
+    row = (
+        results.get('url', ''),
+        meta.get('title', ''),
+        meta.get('description', ''),
+        headers.get('h1_count', 0),
+        ', '.join(headers.get('h1_content', _EMPTY_TUPLE)),
+        headers.get('h2_count', 0),
+        ', '.join(headers.get('h2_content', _EMPTY_TUPLE)),
+        images.get('count', 0),
+        perf.get('load_time_seconds', ''),
+        perf.get('size_bytes', ''),
+        mobile.get('viewport', ''),
+        tech.get('canonical', ''),
+        ','.join(tech.get('hreflang', _EMPTY_TUPLE)),
+        tech.get('noindex', ''),
+    )
     if pagespeed:
-        fieldnames += ['PageSpeed Score', 'LCP', 'CLS', 'FID']
-    with open(output, 'w', encoding='utf-8', newline='') as csvfile:
-        writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-        writer.writeheader()
-        for results in results_list:
-            url = results.get('url', '')
-            meta = results.get('meta_tags', {})
-            headers = results.get('headers', {})
-            images = results.get('images', {})
-            perf = results.get('performance', {})
-            mobile = results.get('mobile_friendly', {})
-            tech = results.get('technical_seo', {})
-            pagespeed_result = results.get('pagespeed', {})
-            row = {
-                'URL': url,
-                'Title tag content': meta.get('title', ''),
-                'Description tag content': meta.get('description', ''),
-                'H1 header count': headers.get('h1_count', 0),
-                'H1 header content': ', '.join(headers.get('h1_content', [])),
-                'H2 header count': headers.get('h2_count', 0),
-                'H2 header content': ', '.join(headers.get('h2_content', [])),
-                'Image count': images.get('count', 0),
-                'Load time': perf.get('load_time_seconds', ''),
-                'Size': perf.get('size_bytes', ''),
-                'Viewport tag': mobile.get('viewport', ''),
-                'Canonical': tech.get('canonical', ''),
-                'hreflang': ','.join(tech.get('hreflang', [])),
-                'Noindex': tech.get('noindex', ''),
-            }
-            if pagespeed:
-                row['PageSpeed Score'] = pagespeed_result.get('score', '')
-                row['LCP'] = pagespeed_result.get('lcp', '')
-                row['CLS'] = pagespeed_result.get('cls', '')
-                row['FID'] = pagespeed_result.get('fid', '')
-            writer.writerow(row)
+        pagespeed_result = results.get('pagespeed', _EMPTY_DICT)
+        row += (
+            pagespeed_result.get('score', ''),
+            pagespeed_result.get('lcp', ''),
+            pagespeed_result.get('cls', ''),
+            pagespeed_result.get('fid', ''),
+        )
+    return row
 
 def display_results(results):
     """Displays the analysis results in a clear table"""
@@ -167,7 +210,7 @@ def display_results(results):
 
     console.print(table)
 
-async def analyze_pagespeed(url):
+async def analyze_pagespeed(url, session):
     api_key = os.environ.get('GOOGLE_PAGESPEED_API_KEY')
     if not api_key:
         return {'error': 'No API key set'}
@@ -177,21 +220,20 @@ async def analyze_pagespeed(url):
         'key': api_key,
         'strategy': 'desktop',  # or 'mobile'
     }
-    async with aiohttp.ClientSession() as session:
-        try:
-            async with session.get(endpoint, params=params) as resp:
-                data = await resp.json()
-                lighthouse = data.get('lighthouseResult', {})
-                categories = lighthouse.get('categories', {})
-                audits = lighthouse.get('audits', {})
-                return {
-                    'score': categories.get('performance', {}).get('score', ''),
-                    'lcp': audits.get('largest-contentful-paint', {}).get('displayValue', ''),
-                    'cls': audits.get('cumulative-layout-shift', {}).get('displayValue', ''),
-                    'fid': audits.get('interactive', {}).get('displayValue', ''),
-                }
-        except Exception as e:
-            return {'error': str(e)}
+    try:
+        async with session.get(endpoint, params=params, timeout=PAGESPEED_TIMEOUT) as resp:
+            data = json_loads(await resp.read())
+            lighthouse = data.get('lighthouseResult', {})
+            categories = lighthouse.get('categories', {})
+            audits = lighthouse.get('audits', {})
+            return {
+                'score': categories.get('performance', {}).get('score', ''),
+                'lcp': audits.get('largest-contentful-paint', {}).get('displayValue', ''),
+                'cls': audits.get('cumulative-layout-shift', {}).get('displayValue', ''),
+                'fid': audits.get('interactive', {}).get('displayValue', ''),
+            }
+    except Exception as e:
+        return {'error': str(e)}
 
 if __name__ == '__main__':
     main() 
\ No newline at end of file
@@ -4,25 +4,89 @@ Main module for SEO analysis
 
 import aiohttp
 import asyncio
-from bs4 import BeautifulSoup
-from typing import Dict, Any, Optional
+import copy
+import functools
+from typing import Dict, Any, List, Optional
 import yaml
 import os
 from urllib.parse import urlparse
 import time
 
+try:
+    from selectolax.lexbor import LexborHTMLParser
+except ImportError:  # selectolax not installed, fall back to BeautifulSoup
+    LexborHTMLParser = None
+try:
+    from bs4 import BeautifulSoup, SoupStrainer
+except ImportError:  # only needed as fallback parser
+    BeautifulSoup = SoupStrainer = None
+
+# Tags the analysis looks at
+ANALYZED_TAGS = ('title', 'meta', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'img', 'a', 'link', 'base')
+# Tags whose text is analyzed; all other tags are reduced to their attributes
+TEXT_TAGS = ('title', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6')
+TAG_SELECTOR = ', '.join(ANALYZED_TAGS)
+# Links with a host part; everything else is relative to the page
+ABSOLUTE_LINK_PREFIXES = ('http://', 'https://', '//')
+# Characters that may follow the host in an absolute link ('' = end of link)
+HOST_TERMINATORS = ('', '/', '?', '#')
+
+# Connection pool size of the analyzer session
+SESSION_CONNECTION_LIMIT = 32
+
+# libyaml based loader if PyYAML was built with it
+YAML_LOADER = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+
+@functools.lru_cache(maxsize=None)
+def _load_config_cached(config_path: str) -> Dict[str, Any]:
+    """
+    Parses a YAML configuration file once per path
+    
+    Later edits to the file are not picked up by this process. The result
+    is shared, so callers must not modify it (see SEOAnalyzer._load_config).
+    """
+    with open(config_path, 'r', encoding='utf-8') as f:
+        return yaml.load(f, Loader=YAML_LOADER)
+
 class SEOAnalyzer:
-    def __init__(self, config_path: str = "config.yaml"):
+    def __init__(self, config_path: str = "config.yaml", session: Optional[aiohttp.ClientSession] = None):
         self.config = self._load_config(config_path)
-        self.session = None
+        self.headers = {"User-Agent": self.config["http"]["user_agent"]}
+        # A session passed in by the caller is shared and not closed here
+        self.session = session
+        self._owns_session = session is None
     
     def _load_config(self, config_path: str) -> Dict[str, Any]:
-        """Loads the configuration from the YAML file"""
+        """
+        Loads the configuration from the YAML file
+        
+        The file is parsed once per path and cached, so changes to it are not
+        seen after the first load. Each analyzer gets its own copy.
+        """
         if not os.path.exists(config_path):
             raise FileNotFoundError(f"Configuration file {config_path} not found")
         
-        with open(config_path, 'r', encoding='utf-8') as f:
-            return yaml.safe_load(f)
+        return copy.deepcopy(_load_config_cached(os.path.abspath(config_path)))
+    
+    def get_session(self) -> aiohttp.ClientSession:
+        """
+        Returns the HTTP session, creating it on first use
+        
+        The session uses a bounded connection pool with DNS cache and the
+        timeout from the configuration. It can also be used by callers for
+        their own requests (e.g. PageSpeed) and is closed by close().
+        
+        There is no per-host limit: the load time is measured from the start
+        of the request, so waiting for a pooled connection would count as load
+        time. Callers should keep their concurrency below the pool limit.
+        """
+        if not self.session:
+            connector = aiohttp.TCPConnector(limit=SESSION_CONNECTION_LIMIT, ttl_dns_cache=300)
+            # Per-phase limits, so time spent waiting for a pooled connection never times out
+            timeout = aiohttp.ClientTimeout(total=None, sock_connect=self.config["http"]["timeout"],
+                                            sock_read=self.config["http"]["timeout"])
+            self.session = aiohttp.ClientSession(connector=connector, timeout=timeout)
+        return self.session
     
     async def analyze_url(self, url: str, depth: int = 1) -> Dict[str, Any]:
         """
@@ -35,53 +99,104 @@ class SEOAnalyzer:
         Returns:
             Dict with the analysis results
         """
-        if not self.session:
-            self.session = aiohttp.ClientSession(
-                headers={"User-Agent": self.config["http"]["user_agent"]}
-            )
-        
+        session = self.get_session()
         try:
-            async with self.session.get(url) as response:
+            start = time.perf_counter()
+            async with session.get(url, headers=self.headers) as response:
                 if response.status != 200:
                     return {"error": f"HTTP {response.status}: {response.reason}"}
                 
-                html = await response.text()
-                return await self._analyze_page(html, url)
+                content = await response.read()
+                load_time = time.perf_counter() - start
+                html = content.decode(response.charset or 'utf-8', errors='replace')
+                performance = self._analyze_performance(response.status, len(content), load_time)
+                return self._analyze_page(html, url, performance)
                 
         except Exception as e:
             return {"error": str(e)}
     
-    async def _analyze_page(self, html: str, url: str) -> Dict[str, Any]:
-        """Analyzes a single page"""
-        soup = BeautifulSoup(html, 'html.parser')
+    def _analyze_page(self, html: str, url: str, performance: Dict[str, Any]) -> Dict[str, Any]:
+        """Analyzes a single page from the already fetched HTML"""
+        tags = self._collect_tags(html)
+        metas = self._index_meta_tags(tags['meta'])
         
         return {
-            "meta_tags": self._analyze_meta_tags(soup),
-            "headers": self._analyze_headers(soup),
-            "images": self._analyze_images(soup),
-            "links": self._analyze_links(soup),
-            "performance": await self._analyze_performance(url),
-            "mobile_friendly": await self._check_mobile_friendly(url),
-            "technical_seo": self._analyze_technical_seo(soup)
+            "meta_tags": self._analyze_meta_tags(tags['title'], metas),
+            "headers": self._analyze_headers(tags),
+            "images": self._analyze_images(tags['img']),
+            "links": self._analyze_links(tags['a'], self._get_domain(tags) or urlparse(url).netloc),
+            "performance": performance,
+            "mobile_friendly": self._check_mobile_friendly(metas),
+            "technical_seo": self._analyze_technical_seo(tags['link'], metas)
         }
     
-    def _analyze_meta_tags(self, soup: BeautifulSoup) -> Dict[str, Any]:
+    def _collect_tags(self, html: str) -> Dict[str, List[Any]]:
+        """
+        Parses the HTML and groups all analyzed tags by name
+        
+        Text tags (title, H1-H6) are stored as their text, all other tags
+        as a dict of their attributes. Uses selectolax if available and
+        BeautifulSoup otherwise; both produce the same buckets.
+        """
+        if LexborHTMLParser is not None:
+            return self._collect_tags_lexbor(html)
+        return self._collect_tags_soup(html)
+    
+    def _collect_tags_lexbor(self, html: str) -> Dict[str, List[Any]]:
+        """Collects the analyzed tags with the selectolax Lexbor parser"""
+        tags = {name: [] for name in ANALYZED_TAGS}
+        for node in LexborHTMLParser(html).css(TAG_SELECTOR):
+            if node.tag == 'title':
+                tags['title'].append(node.text().strip())
+            elif node.tag in TEXT_TAGS:
+                tags[node.tag].append(node.text(strip=True))
+            else:
+                # Lexbor reports attributes without a value as None, BeautifulSoup as ''
+                tags[node.tag].append({k: '' if v is None else v for k, v in node.attributes.items()})
+        return tags
+    
+    def _collect_tags_soup(self, html: str) -> Dict[str, List[Any]]:
+        """Collects the analyzed tags with BeautifulSoup and lxml"""
+        tags = {name: [] for name in ANALYZED_TAGS}
+        soup = BeautifulSoup(html, 'lxml', parse_only=SoupStrainer(list(ANALYZED_TAGS)),
+                             multi_valued_attributes=None)
+        for element in soup.descendants:
+            bucket = tags.get(getattr(element, 'name', None))
+            if bucket is None:
+                continue
+            if element.name == 'title':
+                bucket.append(element.text.strip())
+            elif element.name in TEXT_TAGS:
+                bucket.append(element.get_text(strip=True))
+            else:
+                bucket.append(element.attrs)
+        return tags
+    
+    def _index_meta_tags(self, metas: List[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+        """Maps the name attribute of meta tags to the first tag using it"""
+        index = {}
+        for meta in metas:
+            name = meta.get('name')
+            if name is not None and name not in index:
+                index[name] = meta
+        return index
+    
+    def _analyze_meta_tags(self, titles: List[str], metas: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
         """Analyzes meta tags (title, description)"""
         result = {}
         # Title
-        title_tag = soup.find('title')
-        result['title'] = title_tag.text.strip() if title_tag else None
+        result['title'] = titles[0] if titles else None
         # Description
-        desc_tag = soup.find('meta', attrs={'name': 'description'})
-        result['description'] = desc_tag['content'].strip() if desc_tag and desc_tag.has_attr('content') else None
+        desc = metas.get('description', {}).get('content')
+        result['description'] = desc.strip() if desc is not None else None
         return result
     
-    def _analyze_headers(self, soup: BeautifulSoup) -> Dict[str, Any]:
+    def _analyze_headers(self, tags: Dict[str, List[Any]]) -> Dict[str, Any]:
         """Analyzes header tags (H1-H6) and returns count and content for H1, H2, H3"""
         headers = {}
         for i in range(1, 7):
             tag = f'h{i}'
-            headers[tag] = [h.get_text(strip=True) for h in soup.find_all(tag)]
+            headers[tag] = tags[tag]
         # Specifically for H1, H2, H3: count and content
         summary = {
             'h1_count': len(headers['h1']),
@@ -94,88 +209,94 @@ class SEOAnalyzer:
         }
         return summary
     
-    def _analyze_images(self, soup: BeautifulSoup) -> Dict[str, Any]:
+    def _analyze_images(self, imgs: List[Dict[str, Any]]) -> Dict[str, Any]:
         """Analyzes images and alt texts"""
         images = []
-        for img in soup.find_all('img'):
+        for img in imgs:
             src = img.get('src', '')
             alt = img.get('alt', None)
             images.append({'src': src, 'alt': alt})
         return {'count': len(images), 'images': images}
     
-    def _analyze_links(self, soup: BeautifulSoup) -> Dict[str, Any]:
-        """Analyzes internal and external links"""
+    def _analyze_links(self, anchors: List[Dict[str, Any]], domain: str) -> Dict[str, Any]:
+        """Analyzes internal and external links relative to the site domain"""
         links = {'internal': [], 'external': []}
-        for a in soup.find_all('a', href=True):
-            href = a['href']
-            parsed = urlparse(href)
-            if parsed.netloc == '' or parsed.netloc == self._get_domain(soup):
-                links['internal'].append(href)
+        for a in anchors:
+            href = a.get('href')
+            if href is None:
+                continue
+            # Cheap prefix checks instead of a full urlparse per link
+            link = href.strip()
+            if link[:8].lower().startswith(ABSOLUTE_LINK_PREFIXES):
+                host = link[link.index('//') + 2:]
+                internal = bool(domain) and host.startswith(domain) and \
+                           host[len(domain):len(domain) + 1] in HOST_TERMINATORS
+            elif '://' in link:
+                # Other schemes (e.g. ftp://) are rare, leave them to urlparse
+                netloc = urlparse(link).netloc
+                internal = netloc == '' or netloc == domain
             else:
-                links['external'].append(href)
+                internal = True
+            links['internal' if internal else 'external'].append(href)
         return {'internal_count': len(links['internal']), 'external_count': len(links['external']), 'internal': links['internal'], 'external': links['external']}
     
-    def _get_domain(self, soup: BeautifulSoup) -> str:
-        # Helper function to extract the domain from the soup object (e.g. from canonical link or base tag)
-        canonical = soup.find('link', rel='canonical')
-        if canonical and canonical.has_attr('href'):
+    def _get_domain(self, tags: Dict[str, List[Any]]) -> str:
+        # Helper function to extract the domain from the page tags (e.g. from canonical link or base tag)
+        canonical = self._find_link(tags['link'], 'canonical')
+        if canonical and canonical.get('href'):
             return urlparse(canonical['href']).netloc
-        base = soup.find('base')
-        if base and base.has_attr('href'):
+        base = tags['base'][0] if tags['base'] else None
+        if base and base.get('href'):
             return urlparse(base['href']).netloc
         return ''
     
-    async def _analyze_performance(self, url: str) -> Dict[str, Any]:
-        """Analyzes performance metrics (load time, page size)"""
-        result = {}
-        start = time.perf_counter()
-        try:
-            async with self.session.get(url) as response:
-                content = await response.read()
-                result['status_code'] = response.status
-                result['size_bytes'] = len(content)
-        except Exception as e:
-            result['error'] = str(e)
-            result['status_code'] = None
-            result['size_bytes'] = None
-        end = time.perf_counter()
-        result['load_time_seconds'] = round(end - start, 3)
-        return result
+    def _find_link(self, links: List[Dict[str, Any]], rel: str) -> Optional[Dict[str, Any]]:
+        """Returns the first link tag having the given rel value"""
+        for link in links:
+            if rel in (link.get('rel') or '').lower().split():
+                return link
+        return None
     
-    async def _check_mobile_friendly(self, url: str) -> Dict[str, Any]:
+    def _analyze_performance(self, status_code: int, size_bytes: int, load_time: float) -> Dict[str, Any]:
+        """Collects performance metrics (load time, page size) of the page fetch"""
+        return {
+            'status_code': status_code,
+            'size_bytes': size_bytes,
+            'load_time_seconds': round(load_time, 3)
+        }
+    
+    def _check_mobile_friendly(self, metas: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
         """Checks mobile-first criteria (viewport, mobile meta tags)"""
-        result = {'viewport': False, 'mobile_meta': False}
-        try:
-            async with self.session.get(url) as response:
-                html = await response.text()
-            from bs4 import BeautifulSoup
-            soup = BeautifulSoup(html, 'html.parser')
-            # Viewport tag
-            viewport = soup.find('meta', attrs={'name': 'viewport'})
-            result['viewport'] = viewport is not None
-            # Mobile-optimized meta tags
-            mobile_meta = soup.find('meta', attrs={'name': 'HandheldFriendly'}) or \
-                          soup.find('meta', attrs={'name': 'MobileOptimized'})
-            result['mobile_meta'] = mobile_meta is not None
-        except Exception as e:
-            result['error'] = str(e)
+        result = {}
+        # Viewport tag
+        result['viewport'] = 'viewport' in metas
+        # Mobile-optimized meta tags
+        result['mobile_meta'] = 'HandheldFriendly' in metas or 'MobileOptimized' in metas
         return result
     
-    def _analyze_technical_seo(self, soup: BeautifulSoup) -> Dict[str, Any]:
+    def _analyze_technical_seo(self, links: List[Dict[str, Any]], metas: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
         """Performs technical SEO checks (robots, canonical, noindex, hreflang)"""
         result = {}
-        # Canonical
-        canonical = soup.find('link', rel='canonical')
-        result['canonical'] = canonical['href'] if canonical and canonical.has_attr('href') else None
+        # Canonical and hreflang in a single pass over the link tags
+        canonical = None
+        hreflangs = []
+        for link in links:
+            rel = link.get('rel')
+            if not rel:
+                continue
+            rel = rel.lower().split()
+            if canonical is None and 'canonical' in rel:
+                canonical = link
+            if 'alternate' in rel and link.get('hreflang') is not None:
+                hreflangs.append(link['hreflang'])
+        result['canonical'] = canonical.get('href') if canonical else None
         # Noindex
-        noindex = soup.find('meta', attrs={'name': 'robots'})
-        result['noindex'] = 'noindex' in noindex['content'].lower() if noindex and noindex.has_attr('content') else False
-        # Hreflang
-        hreflangs = [link['hreflang'] for link in soup.find_all('link', rel='alternate') if link.has_attr('hreflang')]
+        robots = metas.get('robots', {}).get('content')
+        result['noindex'] = 'noindex' in robots.lower() if robots is not None else False
         result['hreflang'] = hreflangs
         return result
     
     async def close(self):
-        """Closes the HTTP session"""
-        if self.session:
+        """Closes the HTTP session, unless it was provided by the caller"""
+        if self.session and self._owns_session:
             await self.session.close() 
\ No newline at end of file
@@ -0,0 +1,56 @@
+"""
+Tests für den SEOAnalyzer
+"""
+
+import os
+import unittest
+from seolyzer.core import analyzer
+from seolyzer.core.analyzer import SEOAnalyzer
+
+CONFIG_PATH = os.path.join(os.path.dirname(__file__), '..', '..', 'config.yaml')
+
+HTML = """<html><head><title> Titel </title>
+<meta name="description" content=" Beschreibung "><meta name="viewport" content="width=device-width">
+<meta name="robots" content="NOINDEX"><link rel="Canonical" href="https://example.com/">
+<link rel="alternate" hreflang="de" href="https://example.com/de"><link rel="alternate" hreflang>
+<base href="https://example.com/"></head>
+<body><div><h1>Haupt <b>titel</b></h1><h2>A</h2><h3>B</h3>
+<a href="/intern"><img src="a.png" alt></a><a href>leer</a><a name="anker">ohne href</a>
+<img src="b.png" alt="Bild"><img src="c.png"></div></body></html>"""
+
+class TestAnalyzer(unittest.TestCase):
+    def setUp(self):
+        self.analyzer = SEOAnalyzer(CONFIG_PATH)
+
+    @unittest.skipUnless(analyzer.LexborHTMLParser and analyzer.BeautifulSoup,
+                         "selectolax und BeautifulSoup werden benötigt")
+    def test_parser_buckets_identisch(self):
+        # Beide Parser müssen dieselben Daten an die Analyse liefern
+        lexbor = self.analyzer._collect_tags_lexbor(HTML)
+        soup = self.analyzer._collect_tags_soup(HTML)
+        self.assertEqual(lexbor, soup)
+        # Attribute ohne Wert sind leere Strings, nicht None
+        self.assertEqual(lexbor['img'][0]['alt'], '')
+        self.assertEqual(lexbor['a'][1]['href'], '')
+
+    def test_analyze_links(self):
+        internal = ['/seite', 'seite.html', '#anker', '?q=1', 'mailto:info@example.com', '',
+                    'https://example.com', 'https://example.com/', 'http://example.com?q=1',
+                    'https://example.com#top', '//example.com/cdn', 'HTTPS://example.com/gross',
+                    '  https://example.com/leerzeichen ']
+        external = ['https://other.com/', '//other.com/cdn', 'https://example.com.evil.com/',
+                    'https://example.com:8080/', 'HTTPS://other.com/', ' https://other.com/ws',
+                    'ftp://other.com/datei']
+        links = self.analyzer._analyze_links([{'href': h} for h in internal + external], 'example.com')
+        self.assertEqual(links['internal'], internal)
+        self.assertEqual(links['external'], external)
+        self.assertEqual(links['internal_count'], len(internal))
+        self.assertEqual(links['external_count'], len(external))
+
+    def test_config_pro_instanz(self):
+        # Änderungen an der Konfiguration einer Instanz dürfen andere nicht beeinflussen
+        self.analyzer.config['http']['timeout'] = 1
+        self.assertNotEqual(SEOAnalyzer(CONFIG_PATH).config['http']['timeout'], 1)
+
+if __name__ == '__main__':
+    unittest.main()
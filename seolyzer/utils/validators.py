@@ -6,6 +6,9 @@ import re
 from urllib.parse import urlparse
 from typing import Tuple, Optional
 
+_DOMAIN_RE = re.compile(r'^[a-zA-Z0-9]([a-zA-Z0-9-]{0,61}[a-zA-Z0-9])?(\.[a-zA-Z]{2,})+$')
+_OUTPUT_PATH_RE = re.compile(r'^[a-zA-Z0-9_\-./]+$')
+
 def validate_url(url: str) -> Tuple[bool, Optional[str]]:
     """
     Validiert eine URL
@@ -29,7 +32,7 @@ def validate_url(url: str) -> Tuple[bool, Optional[str]]:
             return False, "Ungültige URL-Struktur"
         
         # Überprüfe auf gültige Domain
-        if not re.match(r'^[a-zA-Z0-9]([a-zA-Z0-9-]{0,61}[a-zA-Z0-9])?(\.[a-zA-Z]{2,})+$', result.netloc):
+        if not _DOMAIN_RE.match(result.netloc):
             return False, "Ungültige Domain"
         
         return True, None
@@ -76,7 +79,7 @@ def validate_output_path(path: str) -> Tuple[bool, Optional[str]]:
         return False, "Ausgabedatei muss die Endung .json haben"
     
     # Überprüfe auf gültige Zeichen im Pfad
-    if not re.match(r'^[a-zA-Z0-9_\-./]+$', path):
+    if not _OUTPUT_PATH_RE.match(path):
         return False, "Ungültige Zeichen im Ausgabepfad"
     
     return True, None 
\ No newline at end of file